@@ -11,10 +11,12 @@ def get_channel_members(channel_id):
 
     if frappe.has_permission("Raven Channel", doc=channel_id):
         member_array = []
-        if frappe.db.exists("Raven Channel", channel_id):
+        # Type is mandatory, so this is only empty if the channel does not exist
+        channel_type = frappe.get_cached_value("Raven Channel", channel_id, "type")
+        if channel_type:
             channel_member = frappe.qb.DocType('Raven Channel Member')
             user = frappe.qb.DocType('Raven User')
-            if frappe.get_cached_value("Raven Channel", channel_id, "type") == "Open":
+            if channel_type == "Open":
                 member_array = get_list()
             else:
                 member_query = (frappe.qb.from_(channel_member)
@@ -1,4 +1,5 @@
 import frappe
+from raven.api.raven_message import check_permission, track_visit
 
 
 @frappe.whitelist()
@@ -49,43 +50,3 @@ def get_message_list(channel_id: str, base_message=None, before_message=None, af
         'messages': messages,
         'has_old_messages': has_old_messages
     }
-
-def check_permission(channel_id):
-    '''
-        Check if the user has permission to view the messages in the channel
-    '''
-    if frappe.get_cached_value('Raven Channel', channel_id, 'type') == 'Private':
-        if frappe.db.exists("Raven Channel Member", {"channel_id": channel_id, "user_id": frappe.session.user}):
-            pass
-        elif frappe.session.user == "Administrator":
-            pass
-        else:
-            frappe.throw(
-                "You don't have permission to view this channel", frappe.PermissionError)
-
-
-def track_visit(channel_id: str, commit=False):
-    '''
-    Track the last visit of the user to the channel.
-    If the user is not a member of the channel, create a new member record
-    '''
-    doc = frappe.db.get_value("Raven Channel Member", {
-        "channel_id": channel_id, "user_id": frappe.session.user}, "name")
-    if doc:
-        frappe.db.set_value("Raven Channel Member", doc,
-                            "last_visit", frappe.utils.now())
-    elif frappe.db.get_value('Raven Channel', channel_id, 'type') == 'Open':
-        frappe.get_doc({
-            "doctype": "Raven Channel Member",
-            "channel_id": channel_id,
-            "user_id": frappe.session.user,
-            "last_visit": frappe.utils.now()
-        }).insert()
-    frappe.publish_realtime(
-            'raven:unread_channel_count_updated', {
-                'channel_id': channel_id,
-                'play_sound': False
-            }, user=frappe.session.user, after_commit=True)
-    # Need to commit the changes to the database if the request is a GET request
-    if commit:
-        frappe.db.commit()
\ No newline at end of file
@@ -1,50 +1,70 @@
 import frappe
 from linkpreview import link_preview
+from concurrent.futures import ThreadPoolExecutor
 import json
 import re
 
+# Matches URLs that point to an IP address (with or without a path)
+IP_ADDRESS_URL_PATTERN = re.compile(r"https?://\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}")
+
+# Maximum number of previews fetched at the same time
+MAX_PREVIEW_WORKERS = 8
+
+EMPTY_PREVIEW = {
+    "title": "",
+    "description": "",
+    "image": "",
+    "force_title": "",
+    "absolute_image": "",
+    "site_name": ""
+}
+
 @frappe.whitelist(methods=['GET'])
 def get_preview_link(urls):
 
-    data = {}
-    empty_data = {
-                        "title": "",
-                        "description": "",
-                        "image": "",
-                        "force_title": "",
-                        "absolute_image": "",
-                        "site_name": ""
-                    }
     message_links = []
 
     if urls and urls != '[]':
         urls = json.loads(urls)
 
-        for url in urls:
-            data = frappe.cache().get_value(url)
-            if data == None:
-                # Don't try to preview insecure links like IP addresses
-                # If URL is an IP address, or starts with mailto or tel, don't preview. Just return empty data
-                if url.startswith('mailto') or url.startswith('tel') or re.match(r'http://\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}/.*', url) or re.match(r'https://\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}/.*', url) or re.match(r'http://\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}', url) or re.match(r'https://\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}', url):
-                    data = empty_data
-                else:
-                    preview = None
-                    try:
-                        preview = link_preview(url)
-                    except:
-                        pass
-                    if preview == None:
-                        data = empty_data
-                    else:
-                        data = {
-                            "title": preview.title,
-                            "description": preview.description,
-                            "image": preview.image,
-                            "force_title": preview.force_title,
-                            "absolute_image": preview.absolute_image,
-                            "site_name": preview.site_name
-                        }
-                    frappe.cache().set_value(url, data)
-            message_links.append(data)
+        message_links = [frappe.cache().get_value(url) for url in urls]
+
+        # Don't try to preview insecure links like IP addresses
+        # If URL is an IP address, or starts with mailto or tel, don't preview. Just return empty data
+        urls_to_fetch = list({url for url, data in zip(urls, message_links)
+                              if data == None and not url.startswith(('mailto', 'tel')) and not IP_ADDRESS_URL_PATTERN.match(url)})
+
+        # Every preview that is not cached is a network request - fetch them in parallel
+        previews = {}
+        if urls_to_fetch:
+            with ThreadPoolExecutor(max_workers=min(len(urls_to_fetch), MAX_PREVIEW_WORKERS)) as executor:
+                previews = dict(zip(urls_to_fetch, executor.map(fetch_preview, urls_to_fetch)))
+            for url, data in previews.items():
+                frappe.cache().set_value(url, data)
+
+        for i, url in enumerate(urls):
+            if message_links[i] == None:
+                message_links[i] = previews.get(url) or dict(EMPTY_PREVIEW)
 
     return message_links
+
+
+def fetch_preview(url):
+    '''
+    Fetch the preview for a URL. Runs in a worker thread, so it should not use frappe.local (no DB or cache access)
+    '''
+    preview = None
+    try:
+        preview = link_preview(url)
+    except:
+        pass
+    if preview == None:
+        return dict(EMPTY_PREVIEW)
+    return {
+        "title": preview.title,
+        "description": preview.description,
+        "image": preview.image,
+        "force_title": preview.force_title,
+        "absolute_image": preview.absolute_image,
+        "site_name": preview.site_name
+    }
@@ -1,6 +1,7 @@
 import frappe
 from frappe import _
 from frappe.model.document import Document
+from frappe.utils.caching import request_cache
 
 channel = frappe.qb.DocType("Raven Channel")
 channel_member = frappe.qb.DocType("Raven Channel Member")
@@ -18,19 +19,20 @@ def get_all_channels(hide_archived=True):
     channels = get_channel_list(hide_archived)
 
     # 3. For every channel, we need to fetch the peer's User ID (if it's a DM)
-    parsed_channels = []
+    # Split channels and DMs in the same pass
+    peer_user_ids = get_peer_user_ids(channels)
+    channel_list = []
+    dm_list = []
     for channel in channels:
         parsed_channel = {
             **channel,
-            "peer_user_id": get_peer_user_id(channel.get('name'), channel.get('is_direct_message'), channel.get('is_self_message')),
+            "peer_user_id": peer_user_ids.get(channel.get('name')),
         }
 
-        parsed_channels.append(parsed_channel)
-
-    channel_list = [
-        channel for channel in parsed_channels if not channel.get('is_direct_message')]
-    dm_list = [channel for channel in parsed_channels if channel.get(
-        'is_direct_message')]
+        if parsed_channel.get('is_direct_message'):
+            dm_list.append(parsed_channel)
+        else:
+            channel_list.append(parsed_channel)
 
     # Get extra users if dm channels length is less than 5
     extra_users = []
@@ -63,9 +65,9 @@ def get_channel_list(hide_archived=False):
 @frappe.whitelist()
 def get_channels(hide_archived=False):
     channels = get_channel_list(hide_archived)
+    peer_user_ids = get_peer_user_ids(channels)
     for channel in channels:
-        peer_user_id = get_peer_user_id(channel.get('name'), channel.get(
-            'is_direct_message'), channel.get('is_self_message'))
+        peer_user_id = peer_user_ids.get(channel.get('name'))
         channel['peer_user_id'] = peer_user_id
         if peer_user_id:
             user_full_name = frappe.get_cached_value(
@@ -74,9 +76,11 @@ def get_channels(hide_archived=False):
     return channels
 
 
+@request_cache
 def get_peer_user_id(channel_id, is_direct_message, is_self_message=False):
     '''
     For a given channel, fetches the user id of the peer
+    Cached for the duration of the request since the same DM can be looked up many times (e.g. timeline content)
     '''
     if is_direct_message == 0:
         return None
@@ -88,19 +92,45 @@ def get_peer_user_id(channel_id, is_direct_message, is_self_message=False):
     }, 'user_id')
 
 
+def get_peer_user_ids(channels):
+    '''
+    For a list of channels, fetches the user id of the peer for every DM in a single query
+    Returns a dict of channel name -> peer user id (only for DMs)
+    '''
+    peer_user_ids = {}
+    dm_channel_ids = []
+    for channel in channels:
+        if channel.get('is_direct_message') == 0:
+            continue
+        if channel.get('is_self_message'):
+            peer_user_ids[channel.get('name')] = frappe.session.user
+        else:
+            dm_channel_ids.append(channel.get('name'))
+
+    if dm_channel_ids:
+        members = frappe.db.get_all('Raven Channel Member', filters={
+            'channel_id': ['in', dm_channel_ids],
+            'user_id': ['!=', frappe.session.user]
+        }, fields=['channel_id', 'user_id'])
+        for member in members:
+            peer_user_ids.setdefault(member.channel_id, member.user_id)
+
+    return peer_user_ids
+
+
 def get_extra_users(dm_channels):
     '''
     Fetch extra users - only when number of DMs is less than 5.
     Do not repeat users already in the list
     '''
-    existing_users = [dm_channel.get('peer_user_id')
-                      for dm_channel in dm_channels]
-    existing_users.append('Administrator')
-    existing_users.append('Guest')
+    # A set, since the same peer can appear more than once (and DMs without a peer have no ID)
+    existing_users = {dm_channel.get('peer_user_id')
+                      for dm_channel in dm_channels if dm_channel.get('peer_user_id')}
+    existing_users.update(('Administrator', 'Guest'))
 
     # Skip permissions since we are only fetching user_id, full_name, and user_image and have applied filters
     return frappe.db.get_all('User', filters=[
-        ['name', 'not in', existing_users],
+        ['name', 'not in', list(existing_users)],
         ['enabled', '=', 1],
         ["Has Role", "role", "=", 'Raven User']], fields=['name', 'full_name', 'user_image'])
 
@@ -12,10 +12,11 @@ message = frappe.qb.DocType('Raven Message')
 user = frappe.qb.DocType("User")
 
 
-def track_visit(channel_id, commit=False):
+def track_visit(channel_id, commit=False, publish_event=True):
     '''
     Track the last visit of the user to the channel.
     If the user is not a member of the channel, create a new member record
+    If publish_event is False, the caller is responsible for notifying the user of the unread count change
     '''
     doc = frappe.db.get_value("Raven Channel Member", {
         "channel_id": channel_id, "user_id": frappe.session.user}, "name")
@@ -29,11 +30,12 @@ def track_visit(channel_id, commit=False):
             "user_id": frappe.session.user,
             "last_visit": frappe.utils.now()
         }).insert()
-    frappe.publish_realtime(
-        'raven:unread_channel_count_updated', {
-            'channel_id': channel_id,
-            'play_sound': False
-        }, user=frappe.session.user, after_commit=True)
+    if publish_event:
+        frappe.publish_realtime(
+            'raven:unread_channel_count_updated', {
+                'channel_id': channel_id,
+                'play_sound': False
+            }, user=frappe.session.user, after_commit=True)
     # Need to commit the changes to the database if the request is a GET request
     if commit:
         frappe.db.commit()
@@ -46,25 +48,19 @@ def send_message(channel_id, text, is_reply, linked_message=None, json=None):
     clean_text = text.replace('<li><br></li>', '').strip()
 
     if clean_text:
+        new_message = {
+            'doctype': 'Raven Message',
+            'channel_id': channel_id,
+            'text': clean_text,
+            'message_type': 'Text',
+            'json': json
+        }
         if is_reply:
-            doc = frappe.get_doc({
-                'doctype': 'Raven Message',
-                'channel_id': channel_id,
-                'text': clean_text,
-                'message_type': 'Text',
+            new_message.update({
                 'is_reply': is_reply,
-                'linked_message': linked_message,
-                'json': json
-            })
-        else:
-            doc = frappe.get_doc({
-                'doctype': 'Raven Message',
-                'channel_id': channel_id,
-                'text': clean_text,
-                'message_type': 'Text',
-                'json': json
+                'linked_message': linked_message
             })
-        doc.insert()
+        frappe.get_doc(new_message).insert()
         return "message sent"
 
 
@@ -185,11 +181,26 @@ def get_messages_with_dates(channel_id):
 
 @frappe.whitelist()
 def get_index_of_message(channel_id, message_id):
-    messages = get_messages(channel_id)
-    parsed_messages = parse_messages(messages)
-    for i in range(len(parsed_messages)):
-        if parsed_messages[i]['block_type'] == 'message' and parsed_messages[i]['data']['name'] == message_id:
-            return i
+    '''
+    Returns the index of the message in the list returned by get_messages_with_dates
+    Walks the messages like parse_messages does (a date block before the first message of every day)
+    and stops as soon as the message is found, without building the parsed list
+    '''
+    messages = frappe.db.get_all('Raven Message',
+                                 filters={'channel_id': channel_id},
+                                 fields=['name', 'creation'],
+                                 order_by='creation asc'
+                                 )
+    index = -1
+    previous_date = None
+    for message in messages:
+        message_date = message['creation'].date()
+        if message_date != previous_date:
+            index += 1
+        index += 1
+        if message['name'] == message_id:
+            return index
+        previous_date = message_date
     return -1
 
 
@@ -228,6 +239,10 @@ def get_unread_count_for_channels():
 @frappe.whitelist()
 def get_timeline_message_content(doctype, docname):
 
+    # This runs for every document that is opened - skip the joins if no message links to the document
+    if not frappe.db.exists("Raven Message", {"link_doctype": doctype, "link_document": docname}):
+        return []
+
     query = (frappe.qb.from_(message)
              .select(message.creation, message.owner, message.name, message.text, message.file, channel.name.as_('channel_id'), channel.channel_name, channel.type, channel.is_direct_message, user.full_name, channel.is_self_message)
              .join(channel).on(message.channel_id == channel.name)
@@ -245,7 +260,7 @@ def get_timeline_message_content(doctype, docname):
             peer_user_id = get_peer_user_id(
                 log.channel_id, log.is_direct_message, log.is_self_message)
             if peer_user_id:
-                log['peer_user'] = frappe.db.get_value(
+                log['peer_user'] = frappe.get_cached_value(
                     "User", peer_user_id, "full_name")
         timeline_contents.append({
             "icon": "share",
@@ -258,11 +273,30 @@ def get_timeline_message_content(doctype, docname):
     return timeline_contents
 
 file_extensions = {
+        'pdf': ['pdf'],
         'doc': ['doc', 'docx', 'odt', 'ott', 'rtf', 'txt', 'dot', 'dotx', 'docm', 'dotm', 'pages'],
         'ppt': ['ppt', 'pptx', 'odp', 'otp', 'pps', 'ppsx', 'pot', 'potx', 'pptm', 'ppsm', 'potm', 'ppam', 'ppa', 'key'],
         'xls': ['xls', 'xlsx', 'csv', 'ods', 'ots', 'xlsb', 'xlsm', 'xlt', 'xltx', 'xltm', 'xlam', 'xla', 'numbers'],
 }
 
+def filter_by_file_type(query, message, file, file_type=None):
+    '''
+    Images are identified by the message type, all other file types by their extension
+    If no file type is given, only messages with images and files are returned
+    '''
+    if not file_type:
+        return query.where(message.message_type.isin(['Image', 'File']))
+
+    if file_type == 'image':
+        return query.where(message.message_type == 'Image')
+
+    # Get the list of extensions for the given file type
+    extensions = file_extensions.get(file_type)
+    if extensions:
+        query = query.where((file.file_type).isin(extensions))
+    return query
+
+
 @frappe.whitelist()
 def get_all_files_shared_in_channel(channel_id, file_name=None, file_type=None, start_after=0, page_length=None):
 
@@ -288,18 +322,7 @@ def get_all_files_shared_in_channel(channel_id, file_name=None, file_type=None,
         query = query.where(file.file_name.like("%" + file_name + "%"))
 
     # search for file type
-    if file_type:
-        if file_type == 'image':
-            query = query.where(message.message_type == 'Image')
-        elif file_type == 'pdf':
-            query = query.where(file.file_type == 'pdf')
-        else:
-            # Get the list of extensions for the given file type
-            extensions = file_extensions.get(file_type)
-            if extensions:
-                query = query.where((file.file_type).isin(extensions))
-    else:
-        query = query.where(message.message_type.isin(['Image', 'File']))
+    query = filter_by_file_type(query, message, file, file_type)
 
     files = query.orderby(message.creation, order=Order['desc']).limit(
         page_length).offset(start_after).run(as_dict=True)
@@ -329,18 +352,7 @@ def get_count_for_pagination_of_files(channel_id, file_name=None, file_type=None
         query = query.where(file.file_name.like("%" + file_name + "%"))
 
     # search for file type
-    if file_type:
-        if file_type == 'image':
-            query = query.where(message.message_type == 'Image')
-        elif file_type == 'pdf':
-            query = query.where(file.file_type == 'pdf')
-        else:
-            # Get the list of extensions for the given file type
-            extensions = file_extensions.get(file_type)
-            if extensions:
-                query = query.where((file.file_type).isin(extensions))
-    else:
-        query = query.where(message.message_type.isin(['Image', 'File']))
+    query = filter_by_file_type(query, message, file, file_type)
     count = query.run(as_dict=True)
 
     return count[0]['count']
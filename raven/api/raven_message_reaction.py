@@ -15,26 +15,16 @@ def calculate_message_reaction(message_id):
     total_reactions = {}
 
     for reaction_item in reactions:
-        if reaction_item.reaction in total_reactions:
-            existing_reaction = total_reactions[reaction_item.reaction]
-            new_users = existing_reaction.get("users")
-            new_users.append(reaction_item.owner)
-            total_reactions[reaction_item.reaction] = {
-                'count': existing_reaction.get('count') + 1,
-                'users': new_users,
-                'reaction': reaction_item.reaction
-            }
-
-        else:
-            total_reactions[reaction_item.reaction] = {
-                'count': 1,
-                'users': [reaction_item.owner],
-                'reaction': reaction_item.reaction
-            }
+        reaction_data = total_reactions.setdefault(reaction_item.reaction, {
+            'count': 0,
+            'users': [],
+            'reaction': reaction_item.reaction
+        })
+        reaction_data['users'].append(reaction_item.owner)
+        reaction_data['count'] += 1
     channel_id = frappe.get_cached_value("Raven Message", message_id, "channel_id")
     frappe.db.set_value('Raven Message', message_id, 'message_reactions', json.dumps(
         total_reactions), update_modified=False)
-    frappe.db.commit()
     frappe.publish_realtime('message_updated', {
         'channel_id': channel_id,
         'sender': frappe.session.user,
@@ -3,6 +3,14 @@ import frappe
 from pypika import Order, JoinType
 import json
 from functools import reduce
+from raven.api.raven_message import file_extensions
+
+# Field to match search_text against (and the LIKE prefix) for each filter type
+search_fields = {
+    'File': ('file', "/private/files/%"),
+    'Message': ('content', "%"),
+    'Channel': ('channel_name', "%"),
+}
 
 
 @frappe.whitelist()
@@ -12,13 +20,6 @@ def get_search_result(filter_type, doctype, search_text=None, from_user=None, in
     channel = frappe.qb.DocType("Raven Channel")
     message = frappe.qb.DocType("Raven Message")
 
-    file_extensions = {
-        'pdf': 'pdf',
-        'doc': ['doc', 'docx', 'odt', 'ott', 'rtf', 'txt', 'dot', 'dotx', 'docm', 'dotm', 'pages'],
-        'ppt': ['ppt', 'pptx', 'odp', 'otp', 'pps', 'ppsx', 'pot', 'potx', 'pptm', 'ppsm', 'potm', 'ppam', 'ppa', 'key'],
-        'xls': ['xls', 'xlsx', 'csv', 'ods', 'ots', 'xlsb', 'xlsm', 'xlt', 'xltx', 'xltm', 'xlam', 'xla', 'numbers'],
-    }
-
     query = frappe.qb.from_(doctype).select(
         doctype.name, doctype.file, doctype.owner, doctype.creation, doctype.message_type, doctype.channel_id, doctype.text, doctype.content).join(channel, JoinType.left).on(doctype.channel_id == channel.name).join(channel_member, JoinType.left).on(
             channel_member.channel_id == doctype.channel_id).where((channel.type != 'Private') | (channel_member.user_id == frappe.session.user))
@@ -35,15 +36,10 @@ def get_search_result(filter_type, doctype, search_text=None, from_user=None, in
             doctype.name, doctype.owner, doctype.creation, doctype.type, doctype.channel_name, doctype.channel_description, doctype.is_archived).join(channel_member, JoinType.left).on(
             channel_member.channel_id == doctype.name).where(doctype.is_direct_message == 0).where((doctype.type != 'Private') | (channel_member.user_id == frappe.session.user)).distinct()
 
-    if search_text:
-        if filter_type == 'File':
-            query = query.where(doctype.file.like(
-                "/private/files/%" + search_text + "%"))
-        elif filter_type == 'Message':
-            query = query.where(doctype.content.like("%" + search_text + "%"))
-        elif filter_type == 'Channel':
-            query = query.where(
-                doctype.channel_name.like("%" + search_text + "%"))
+    if search_text and filter_type in search_fields:
+        fieldname, prefix = search_fields[filter_type]
+        query = query.where(doctype[fieldname].like(
+            prefix + search_text + "%"))
 
     if from_user:
         query = query.where(doctype.owner == from_user)
@@ -62,21 +58,15 @@ def get_search_result(filter_type, doctype, search_text=None, from_user=None, in
         filters = []
         for type in file_type:
             if type != 'image' and type in file_extensions:
-                if isinstance(file_extensions[type], list):
-                    filters.append(
-                        reduce(
-                            operator.or_, [
-                                doctype.file.like(
-                                    "/private/files/%." + ext)
-                                for ext in file_extensions[type]
-                            ]
-                        )
-                    )
-                else:
-                    filters.append(
-                        doctype.file.like(
-                            "/private/files/%." + file_extensions[type])
+                filters.append(
+                    reduce(
+                        operator.or_, [
+                            doctype.file.like(
+                                "/private/files/%." + ext)
+                            for ext in file_extensions[type]
+                        ]
                     )
+                )
         if filters:
             if 'image' in file_type:
                 query = query.where((doctype.message_type == 'Image') | (
@@ -7,6 +7,12 @@ from mimetypes import guess_type
 from frappe.core.doctype.file.utils import get_local_image
 from frappe import _
 
+IMAGE_EXTENSIONS = frozenset(['jpg', 'JPG', 'jpeg', 'JPEG', 'png', 'PNG', 'gif', 'GIF'])
+
+# Thumbnails are at most 480px wide (landscape) or 320px high (portrait)
+MAX_THUMBNAIL_WIDTH = 480
+MAX_THUMBNAIL_HEIGHT = 320
+
 
 def upload_JPEG_wrt_EXIF(content, filename):
     '''
@@ -52,9 +58,6 @@ def upload_file_with_message():
         3. If the file is an image, we need to measure it's dimensions
         4. Store the file URL and the dimensions in the Raven Message Doc
     '''
-    fileExt = ['jpg', 'JPG', 'jpeg', 'JPEG', 'png', 'PNG', 'gif', 'GIF']
-    thumbnailExt = ['jpg', 'JPG', 'jpeg', 'JPEG', 'png', 'PNG']
-
     frappe.form_dict.doctype = "Raven Message"
     frappe.form_dict.fieldname = "file"
 
@@ -85,23 +88,20 @@ def upload_file_with_message():
 
     message_doc.file = file_doc.file_url
 
-    if file_doc.file_type in fileExt:
+    if file_doc.file_type in IMAGE_EXTENSIONS:
 
         message_doc.message_type = "Image"
 
         image, filename, extn = get_local_image(file_doc.file_url)
         width, height = image.size
 
-        MAX_WIDTH = 480
-        MAX_HEIGHT = 320
-
         # If it's a landscape image, then the thumbnail needs to be 480px wide
         if width > height:
-            thumbnail_width = min(width, MAX_WIDTH)
+            thumbnail_width = min(width, MAX_THUMBNAIL_WIDTH)
             thumbnail_height = int(height * thumbnail_width / width)
         
         else:
-            thumbnail_height = min(height, MAX_HEIGHT)
+            thumbnail_height = min(height, MAX_THUMBNAIL_HEIGHT)
             thumbnail_width = int(width * thumbnail_height / height)
 
         # thumbnail_size = thumbnail_width, thumbnail_height
@@ -3,14 +3,14 @@ import frappe
 
 def set_user_active():
     # Set the user's session ID in the cache
-    print("Setting the user as active", frappe.session.user)
+    frappe.logger("raven").debug("Setting the user as active: %s", frappe.session.user)
     frappe.cache().set_value(
         f'user_session_{frappe.session.user}', frappe.session.user, expires_in_sec=900)
 
 
 def set_user_inactive():
     # Remove the user's session ID from the cache
-    print("Setting the user as inactive", frappe.session.user)
+    frappe.logger("raven").debug("Setting the user as inactive: %s", frappe.session.user)
     frappe.cache().delete_key(f'user_session_{frappe.session.user}')
 
 
@@ -21,8 +21,9 @@ def get_active_users():
     # Decode the keys and split them to get the key name
     decoded_keys = [key.decode('utf-8').split('|')[1]
                     for key in user_session_keys]
-    # Get the user IDs from the cache
-    user_ids = [frappe.cache().get_value(key) for key in decoded_keys]
+    # The value stored against each key is the user ID, which is also part of the key name.
+    # Read it from the key instead of making a round trip to the cache for every active user
+    user_ids = [key.removeprefix('user_session_') for key in decoded_keys]
 
     return user_ids
 
@@ -28,8 +28,8 @@ def add_standard_navbar_items():
 	current_navbar_items = navbar_settings.settings_dropdown
 	navbar_settings.set("settings_dropdown", [])
 
+	current_labels = {item.get("item_label") for item in current_navbar_items}
 	for item in raven_navbar_items:
-		current_labels = [item.get("item_label") for item in current_navbar_items]
 		if not item.get("item_label") in current_labels:
 			navbar_settings.append("settings_dropdown", item)
 
@@ -10,10 +10,13 @@ def execute():
     # This patch creates Raven Users for all users with the "Raven User" role.
     users = frappe.get_all("User",
                            filters=[["name", "not in", ["Guest"]], [
-                               "Has Role", "role", "=", 'Raven User']])
+                               "Has Role", "role", "=", 'Raven User']], pluck="name")
+
+    # Users who already have a Raven User - no new one is created for them
+    existing_raven_users = set(frappe.get_all("Raven User", pluck="user"))
 
     for user in users:
-        if not frappe.db.exists("Raven User", { "user": user.name } ):
+        if user not in existing_raven_users:
             raven_user = frappe.new_doc("Raven User")
-            raven_user.user = user.name
+            raven_user.user = user
             raven_user.insert()
\ No newline at end of file
@@ -9,10 +9,17 @@ def execute():
     '''
     messages = frappe.db.get_all('Raven Message', fields=[
                                  'name', 'linked_message'], filters={'is_reply': 1})
+
+    # Messages that are replied to, keyed by name
+    linked_message_ids = list({message.linked_message for message in messages if message.linked_message})
+    linked_messages = {}
+    if linked_message_ids:
+        linked_messages = {linked_message.name: linked_message for linked_message in frappe.db.get_all(
+            "Raven Message", filters={'name': ['in', linked_message_ids]}, fields=["name", "text", "content", "file", "message_type", "owner", "creation"])}
+
     for message in messages:
         if message.linked_message:
-            details = frappe.db.get_value(
-                "Raven Message", message.linked_message, ["text", "content", "file", "message_type", "owner", "creation"], as_dict=True)
+            details = linked_messages.get(message.linked_message)
             frappe.db.set_value("Raven Message", message.name, "replied_message_details", json.dumps({
                 "text": details.text,
                 "content": details.content,
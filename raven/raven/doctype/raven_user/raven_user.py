@@ -44,8 +44,11 @@ class RavenUser(Document):
 		 Why not just copy the URL from the User record? Because the URL is not accessible to the Raven User,
 		 and Frappe creates a duplicate file in the system (that is public) but does not update the URL in the field.
 		'''
+		# Nothing to do if the Raven User already has a photo - skip looking up the User
+		if self.user_image:
+			return
 		user_image = frappe.db.get_value("User", self.user, "user_image")
-		if user_image and not self.user_image:
+		if user_image:
 			image_file = frappe.get_doc(
 						{
 							"doctype": "File",
@@ -67,25 +70,22 @@ def add_user_to_raven(doc,method):
 
 	# If the user is already added to Raven, do nothing.
 	if not doc.flags.deleting_raven_user:
-		if frappe.db.exists("Raven User", {"user": doc.name}):
+		user_roles = {d.role for d in doc.get("roles")}
+		raven_user = frappe.db.get_value("Raven User", {"user": doc.name},
+			["name", "enabled", "full_name", "first_name", "user_image"], as_dict=True)
+		if raven_user:
 			# Check if the role is still present. If not, then inactivate the Raven User record.
-			has_raven_role = False
-			for role in doc.get("roles"):
-				if role.role == "Raven User":
-					has_raven_role = True
-					break
-			
-			if has_raven_role:
-				raven_user = frappe.get_doc("Raven User", {"user": doc.name})
-				if not doc.full_name:
-					raven_user.full_name = doc.first_name
-				raven_user.enabled = 1
-				raven_user.save(ignore_permissions=True)
-			else:
-				raven_user = frappe.get_doc("Raven User", {"user": doc.name})
+			enabled = 1 if "Raven User" in user_roles else 0
+
+			# Saving the Raven User re-fetches the name and photo from the User, so only save if something has changed
+			if (raven_user.enabled != enabled
+				or raven_user.full_name != (doc.full_name or doc.first_name)
+				or raven_user.first_name != doc.first_name
+				or (doc.user_image and not raven_user.user_image)):
+				raven_user = frappe.get_doc("Raven User", raven_user.name)
 				if not doc.full_name:
 					raven_user.full_name = doc.first_name
-				raven_user.enabled = 0
+				raven_user.enabled = enabled
 				raven_user.save(ignore_permissions=True)
 		else:
 			# Raven user does not exist.
@@ -93,7 +93,7 @@ def add_user_to_raven(doc,method):
 			if frappe.db.exists("User", doc.name):
 				# Check if the user is a system user.
 				if doc.user_type == "System User":
-					auto_add = frappe.db.get_single_value("Raven Settings", "auto_add_system_users")
+					auto_add = frappe.get_cached_doc("Raven Settings").auto_add_system_users
 
 					if auto_add:
 						doc.append("roles", {"role": "Raven User"})
@@ -105,7 +105,7 @@ def add_user_to_raven(doc,method):
 						raven_user.enabled = 1
 						raven_user.insert(ignore_permissions=True)
 				else:
-					if "Raven User" in [d.role for d in doc.get("roles")]:
+					if "Raven User" in user_roles:
 						# Create a Raven User record for the user.
 						raven_user = frappe.new_doc("Raven User")
 						raven_user.user = doc.name
@@ -35,6 +35,15 @@ class RavenChannel(Document):
         # delete all members when channel is deleted
         frappe.db.delete("Raven Channel Member", {"channel_id": self.name})
 
+        # delete all reactions on the channel's messages - messages are deleted in bulk below, so their on_trash does not run
+        reaction = frappe.qb.DocType("Raven Message Reaction")
+        message = frappe.qb.DocType("Raven Message")
+        frappe.qb.from_(reaction).delete().where(
+            reaction.message.isin(
+                frappe.qb.from_(message).select(message.name).where(message.channel_id == self.name)
+            )
+        ).run()
+
         # delete all messages when channel is deleted
         frappe.db.delete("Raven Message", {"channel_id": self.name})
 
@@ -85,12 +94,13 @@ class RavenChannel(Document):
             self.channel_name = self.channel_name.strip().lower().replace(" ", "-")
 
     def add_members(self, members, is_admin=0):
+        # Users from the list who are already members of the channel - they are skipped below
+        existing_members = set(frappe.db.get_all("Raven Channel Member", filters={
+            "channel_id": self.name,
+            "user_id": ["in", members]
+        }, pluck="user_id")) if members else set()
         for member in members:
-            doc = frappe.db.get_value("Raven Channel Member", filters={
-                "channel_id": self.name,
-                "user_id": member
-            }, fieldname="name")
-            if doc:
+            if member in existing_members:
                 continue
             else:
                 channel_member = frappe.get_doc({
@@ -100,6 +110,7 @@ class RavenChannel(Document):
                     "is_admin": is_admin
                 })
                 channel_member.insert()
+                existing_members.add(member)
 
     def autoname(self):
         if self.is_direct_message == 0:
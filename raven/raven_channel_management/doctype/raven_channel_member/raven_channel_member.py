@@ -23,31 +23,32 @@ class RavenChannelMember(Document):
             self.is_admin = 1
 
     def after_delete(self):
-        if frappe.db.count("Raven Channel Member", {"channel_id": self.channel_id}) == 0 and frappe.db.get_value("Raven Channel", self.channel_id, "type") == "Private":
+        # Count the remaining members once - both checks below need it
+        member_count = frappe.db.count("Raven Channel Member", {"channel_id": self.channel_id})
+        if member_count == 0 and frappe.get_cached_value("Raven Channel", self.channel_id, "type") == "Private":
             frappe.db.set_value("Raven Channel", self.channel_id,
                                 "is_archived", 1)
-        if self.get_admin_count() == 0 and frappe.db.count("Raven Channel Member", {"channel_id": self.channel_id}) > 0:
+        if member_count > 0 and self.get_admin_count() == 0:
             first_member = frappe.db.get_value("Raven Channel Member", {
-                                               "channel_id": self.channel_id}, ["name"], as_dict=1, order_by="creation")
+                                               "channel_id": self.channel_id}, "name", order_by="creation")
             frappe.db.set_value("Raven Channel Member",
-                                first_member.name, "is_admin", 1)
+                                first_member, "is_admin", 1)
 
     def on_trash(self):
         # if the leaving member is admin, then the first member becomes new admin
         if self.is_admin == 1 and frappe.db.count("Raven Channel Member", {"channel_id": self.channel_id}) > 0:
             first_member = frappe.db.get_value("Raven Channel Member", {
-                                               "channel_id": self.channel_id}, ["name"], as_dict=1, order_by="creation")
+                                               "channel_id": self.channel_id}, "name", order_by="creation")
             frappe.db.set_value("Raven Channel Member",
-                                first_member.name, "is_admin", 1)
+                                first_member, "is_admin", 1)
         if not self.check_if_user_is_member():
             frappe.throw(
                 "You don't have permission to remove members from this channel", frappe.PermissionError)
-        frappe.db.commit()
 
     def check_if_user_is_member(self):
         is_member = True
-        channel = frappe.db.get_value("Raven Channel", self.channel_id, [
-                                      "type", "owner"], as_dict=True)
+        channel = frappe.get_cached_value("Raven Channel", self.channel_id, [
+                                          "type", "owner"], as_dict=True)
         if channel.type == "Private":
             # A user can only add members to a private channel if they are themselves member of the channel or if they are the owner of a new channel
             if channel.owner == frappe.session.user and frappe.db.count("Raven Channel Member", {"channel_id": self.channel_id}) == 0:
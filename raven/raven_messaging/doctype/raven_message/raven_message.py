@@ -41,7 +41,8 @@ class RavenMessage(Document):
 
     def before_validate(self):
         try:
-            if self.text:
+            # Only convert the text if it has changed - messages are also saved for file uploads and other updates
+            if self.text and (self.is_new() or self.has_value_changed("text")):
                 content = html2text(self.text)
                 # Remove trailing new line characters and white spaces
                 self.content = content.rstrip()
@@ -67,16 +68,27 @@ class RavenMessage(Document):
         If there is a linked message, the linked message should be in the same channel
         '''
         if self.linked_message:
-            if frappe.db.get_value("Raven Message", self.linked_message, "channel_id") != self.channel_id:
+            details = self.get_linked_message_details()
+            if not details or details.channel_id != self.channel_id:
                 frappe.throw(_("Linked message should be in the same channel"))
 
+    def get_linked_message_details(self):
+        '''
+        Fetch the linked message once - it's needed both in before_insert and validate
+        '''
+        details = self.flags.linked_message_details
+        if not details or details.name != self.linked_message:
+            details = frappe.db.get_value(
+                "Raven Message", self.linked_message, ["name", "channel_id", "text", "content", "file", "message_type", "owner", "creation"], as_dict=True)
+            self.flags.linked_message_details = details
+        return details
+
     def before_insert(self):
         '''
         If the message is a reply, update the replied_message_details field
         '''
         if self.is_reply and self.linked_message:
-            details = frappe.db.get_value(
-                "Raven Message", self.linked_message, ["text", "content", "file", "message_type", "owner", "creation"], as_dict=True)
+            details = self.get_linked_message_details()
             self.replied_message_details = {
                 "text": details.text,
                 "content": details.content,
@@ -92,17 +104,18 @@ class RavenMessage(Document):
                 'channel_id': self.channel_id,
                 'play_sound': True,
                 'sent_by': self.owner,
-            })
+            }, after_commit=True)
 
     def process_mentions(self):
-        if not self.json:
+        if not isinstance(self.json, dict):
             return
 
-        try:
-            content = self.json.get('content', [{}])[0].get('content', [])
-        except (IndexError, AttributeError):
+        paragraphs = self.json.get('content', [{}])
+        if not paragraphs or not isinstance(paragraphs, list) or not isinstance(paragraphs[0], dict):
             return
 
+        content = paragraphs[0].get('content', [])
+
         entered_ids = set()
         for item in content:
             if item.get('type') == 'userMention':
@@ -128,7 +141,6 @@ class RavenMessage(Document):
             # Adding this to automatically add the room for the event via Frappe
             docname=self.channel_id,
             after_commit=True)
-        frappe.db.commit()
 
     def on_trash(self):
         # delete all the reactions for the message
@@ -137,7 +149,8 @@ class RavenMessage(Document):
     def before_save(self):
         # TODO: Remove this
         if frappe.get_cached_value('Raven Channel', self.channel_id, 'type') != 'Private' or frappe.db.exists("Raven Channel Member", {"channel_id": self.channel_id, "user_id": frappe.session.user}):
-            track_visit(self.channel_id)
+            # For new messages, the event published in after_insert also notifies the sender
+            track_visit(self.channel_id, publish_event=not self.is_new())
 
 
 def on_doctype_update():
@@ -147,3 +160,5 @@ def on_doctype_update():
     # Index the selector (channel or message type) first for faster queries (less rows to sort in the next step)
     frappe.db.add_index("Raven Message", ["channel_id", "creation"])
     frappe.db.add_index("Raven Message", ["message_type", "creation"])
+    # Used to look up messages linked to a document (timeline on every form)
+    frappe.db.add_index("Raven Message", ["link_doctype", "link_document"])
@@ -14,16 +14,9 @@ def get_context(context):
     # context.csrf_token = csrf_token
 
     if frappe.session.user == "Guest":
-        boot = frappe.website.utils.get_boot_data()
+        boot_json = sanitize_boot_json(frappe.website.utils.get_boot_data())
     else:
-        try:
-            boot = frappe.sessions.get()
-        except Exception as e:
-            raise frappe.SessionBootFailed from e
-    boot_json = frappe.as_json(boot, indent=None, separators=(",", ":"))
-    boot_json = SCRIPT_TAG_PATTERN.sub("", boot_json)
-
-    boot_json = CLOSING_SCRIPT_TAG_PATTERN.sub("", boot_json)
+        boot_json = get_boot_json()
     boot_json = json.dumps(boot_json)
 
     context.update({
@@ -39,19 +32,23 @@ def get_context(context):
 def get_context_for_dev():
 	if not frappe.conf.developer_mode:
 		frappe.throw('This method is only meant for developer mode')
-	return json.loads(get_boot())
+	# The sanitized boot JSON string is what the page receives, no need to encode and decode it again
+	return get_boot_json()
 
 
-def get_boot():
+def get_boot_json():
     try:
         boot = frappe.sessions.get()
     except Exception as e:
         raise frappe.SessionBootFailed from e
 
+    return sanitize_boot_json(boot)
+
+
+def sanitize_boot_json(boot):
     boot_json = frappe.as_json(boot, indent=None, separators=(",", ":"))
     boot_json = SCRIPT_TAG_PATTERN.sub("", boot_json)
 
     boot_json = CLOSING_SCRIPT_TAG_PATTERN.sub("", boot_json)
-    boot_json = json.dumps(boot_json)
 
     return boot_json
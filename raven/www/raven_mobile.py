@@ -1,35 +1,4 @@
-import frappe
-import json
-import frappe.sessions
-import re
+# The mobile app boots exactly like the web app - reuse its context (and its precompiled script tag patterns)
+from raven.www.raven import get_context
 
 no_cache = 1
-
-SCRIPT_TAG_PATTERN = re.compile(r"\<script[^<]*\</script\>")
-CLOSING_SCRIPT_TAG_PATTERN = re.compile(r"</script\>")
-
-def get_context(context):
-    csrf_token = frappe.sessions.get_csrf_token()
-    frappe.db.commit()
-    # context.csrf_token = csrf_token
-
-    if frappe.session.user == "Guest":
-        boot = frappe.website.utils.get_boot_data()
-    else:
-        try:
-            boot = frappe.sessions.get()
-        except Exception as e:
-            raise frappe.SessionBootFailed from e
-    boot_json = frappe.as_json(boot, indent=None, separators=(",", ":"))
-    boot_json = SCRIPT_TAG_PATTERN.sub("", boot_json)
-
-    boot_json = CLOSING_SCRIPT_TAG_PATTERN.sub("", boot_json)
-    boot_json = json.dumps(boot_json)
-
-    context.update({
-        "build_version": frappe.utils.get_build_version(),
-        "boot": boot_json,
-        "csrf_token": csrf_token,
-    })
-
-    return context
\ No newline at end of file